@@ -1,9 +1,12 @@
 import streamlit as st
-import os
-import tempfile
-from utils.pdf_parser import PDFParser
+import io
+import hashlib
+import threading
 import pandas as pd
-import shutil
+from utils.pdf_parser import PDFParser, HAS_PYMUPDF4LLM
+import zipfile
+from collections import OrderedDict
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 
 # Set page config
@@ -20,233 +23,341 @@ def get_parser():
 
 parser = get_parser()
 
+# Keep one pool of worker processes for the whole server, so uploads reuse warm workers
+@st.cache_resource
+def get_worker_pool():
+    return parser.create_worker_pool()
+
+# Number of uploads whose extraction results are kept for the whole server
+RESULTS_CACHE_SIZE = 16
+
+# Extraction results per uploaded file, keyed by the SHA-256 of its contents (least
+# recently used first). This is a plain store rather than st.cache_data: a cached
+# function would record the progress bar updates and replay them on a cache hit,
+# against a progress bar that no longer exists
+@st.cache_resource
+def get_results_cache():
+    return OrderedDict(), threading.Lock()
+
+def process_pdf_cached(file_hash, uploaded_file, progress_cb=None):
+    """Return the extraction results of an upload, running the parser only on a cache miss."""
+    cache, lock = get_results_cache()
+    with lock:
+        results = cache.get(file_hash)
+        if results is not None:
+            cache.move_to_end(file_hash)
+            return results
+    
+    # PyMuPDF and pdfplumber read the upload straight from memory
+    data = uploaded_file.getvalue()
+    try:
+        results = parser.process_pdf_bytes(data, progress_cb=progress_cb, pool=get_worker_pool())
+    except BrokenProcessPool:
+        # A worker died (e.g. MuPDF crashed on a malformed file), which breaks the whole
+        # pool; replace it so later uploads still work, and give this one a second try
+        get_worker_pool.clear()
+        try:
+            results = parser.process_pdf_bytes(data, progress_cb=progress_cb, pool=get_worker_pool())
+        except BrokenProcessPool:
+            get_worker_pool.clear()
+            raise RuntimeError("A worker process crashed while processing this PDF; the file may be damaged.")
+    
+    # Keep only the bytes encoded by the parser, not the decoded page images
+    for img_item in results['images']:
+        img_item.pop('image', None)
+    
+    with lock:
+        cache[file_hash] = results
+        while len(cache) > RESULTS_CACHE_SIZE:
+            cache.popitem(last=False)
+    return results
+
+def hash_upload(uploaded_file):
+    """Return the SHA-256 hex digest of an uploaded file, read in 1 MiB chunks."""
+    digest = hashlib.sha256()
+    uploaded_file.seek(0)
+    for chunk in iter(lambda: uploaded_file.read(1024 * 1024), b''):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+def build_metadata_df(metadata):
+    """Build the metadata table shown in the Metadata tab."""
+    # Values are stringified so the column has a single type (page counts are ints)
+    return pd.DataFrame(
+        {'Value': [str(value) for value in metadata.values()]},
+        index=pd.Index(list(metadata.keys()), name='Property')
+    )
+
+def build_results_zip(results):
+    """Build the ZIP of all results in memory."""
+    buf = io.BytesIO()
+    # Images are already compressed, so they are stored as is; text and CSV
+    # entries get zlib's fastest DEFLATE level, which shrinks them cheaply
+    text_entry = {'compress_type': zipfile.ZIP_DEFLATED, 'compresslevel': 1}
+    with zipfile.ZipFile(buf, 'w', zipfile.ZIP_STORED) as zf:
+        zf.writestr('metadata.txt', "".join(f"{key}: {value}\n" for key, value in results['metadata'].items()), **text_entry)
+        
+        if results['text']:
+            zf.writestr('extracted_text.txt', "".join(
+                f"=== Page {text_item['page']} ===\n{text_item['content']}\n\n" for text_item in results['text']
+            ), **text_entry)
+        
+        for table in results['tables']:
+            zf.writestr(f"tables/page_{table['page']}_table_{table['table_num']}.csv", table['csv_bytes'], **text_entry)
+        
+        if results['ocr_text']:
+            zf.writestr('ocr_text.txt', "".join(
+                f"=== Page {ocr_item['page']} ===\n{ocr_item['content']}\n\n" for ocr_item in results['ocr_text']
+            ), **text_entry)
+        
+        for img_item in results['images']:
+            zf.writestr(f"images/page_{img_item['page']}.png", img_item['png_bytes'])
+    
+    return buf.getvalue()
+
 st.title("📄 PDF Parser")
 st.write("Upload PDF documents to extract text, tables, and images.")
 
-# Check for optional dependencies
-try:
-    from pdf2image import convert_from_path
-    has_pdf2image = True
-except (ImportError, ModuleNotFoundError):
-    has_pdf2image = False
-
-try:
-    import pytesseract
-    has_pytesseract = True
-except (ImportError, ModuleNotFoundError):
-    has_pytesseract = False
-
-try:
-    import pymupdf4llm
-    has_pymupdf4llm = True
-except (ImportError, ModuleNotFoundError):
-    has_pymupdf4llm = False
-
-# Simple notification about missing dependencies
-if not has_pdf2image:
-    st.info("Note: Using fallback image extraction method. For better quality, install pdf2image and Poppler.")
-
-if not has_pytesseract:
-    st.info("Note: Using PyMuPDF's built-in OCR instead of pytesseract. This requires the TESSDATA_PREFIX environment variable to be set.")
-    # Add a configuration section for OCR if needed
-    with st.expander("OCR Configuration"):
+# Display names of the OCR engines the parser can pick (PDFParser.ocr_engine)
+OCR_ENGINE_NAMES = {
+    'tesserocr': "tesserocr",
+    'pytesseract': "pytesseract",
+    'pymupdf': "PyMuPDF's built-in OCR engine"
+}
+
+# Static dependency notes live in the sidebar, away from the main-area widgets
+with st.sidebar:
+    if parser.ocr_engine not in ('tesserocr', 'pytesseract'):
+        st.info("Note: Using PyMuPDF's built-in OCR instead of Tesseract (tesserocr or pytesseract). This requires the TESSDATA_PREFIX environment variable to be set.")
+        # Add a configuration section for OCR if needed
+        with st.expander("OCR Configuration"):
+            st.markdown("""
+            ### Setting up PyMuPDF OCR
+            
+            For OCR to work with PyMuPDF, set the `TESSDATA_PREFIX` environment variable to the path where Tesseract language data is located.
+            
+            **Example on Windows:**
+            ```
+            set TESSDATA_PREFIX=C:\Program Files\Tesseract-OCR\tessdata
+            ```
+            
+            **Example on Linux/macOS:**
+            ```
+            export TESSDATA_PREFIX=/usr/share/tesseract-ocr/4.00/tessdata
+            ```
+            
+            Restart the application after setting the environment variable.
+            """)
+
+    with st.expander("Faster OCR"):
         st.markdown("""
-        ### Setting up PyMuPDF OCR
-        
-        For OCR to work with PyMuPDF, set the `TESSDATA_PREFIX` environment variable to the path where Tesseract language data is located.
+        Tesseract runs its LSTM engine (`--oem 1`) and reads each page as one block of text (`--psm 6`).
         
-        **Example on Windows:**
+        For about 3x faster OCR, download the fast models from
+        [tessdata_fast](https://github.com/tesseract-ocr/tessdata_fast) (e.g. `eng.traineddata`)
+        and point `TESSDATA_FAST_PREFIX` at the folder holding them:
         ```
-        set TESSDATA_PREFIX=C:\Program Files\Tesseract-OCR\tessdata
-        ```
-        
-        **Example on Linux/macOS:**
-        ```
-        export TESSDATA_PREFIX=/usr/share/tesseract-ocr/4.00/tessdata
+        export TESSDATA_FAST_PREFIX=/path/to/tessdata_fast
         ```
         
         Restart the application after setting the environment variable.
         """)
 
-if has_pymupdf4llm:
-    st.success("Enhanced text extraction with PyMuPDF4LLM is enabled. This provides better formatted text extraction, especially for complex PDF layouts.")
+    if HAS_PYMUPDF4LLM:
+        st.success("Enhanced text extraction with PyMuPDF4LLM is enabled. This provides better formatted text extraction, especially for complex PDF layouts.")
+
+# Combined page text is memoized per upload so reruns do not rebuild it
+@st.cache_data(show_spinner=False, max_entries=32)
+def combine_pages(file_hash, label, _items):
+    return "".join(f"--- PAGE {item['page']}{label} ---\n\n{item['content']}\n\n" for item in _items)
+
+# Each tab is a fragment, so interacting with one tab only reruns that tab
+@st.fragment
+def render_metadata_tab(metadata_df):
+    """Render the document metadata tab."""
+    st.header("Document Metadata")
+    st.dataframe(metadata_df, use_container_width=True)
+
+@st.fragment
+def render_text_tab(results, file_hash):
+    """Render the extracted text tab."""
+    st.header("Extracted Text")
+    if results['text']:
+        if HAS_PYMUPDF4LLM:
+            st.success("Text extracted using enhanced PyMuPDF4LLM for better formatting and layout preservation.")
+
+        st.info(f"Showing all extracted text from {len(results['text'])} pages")
+
+        # Display all pages in a single scrollable container with page separators
+        all_text = combine_pages(file_hash, "", results['text'])
+
+        st.text_area(
+            label="All Text Content",
+            value=all_text,
+            height=600,
+            key="all_text_content"
+        )
+
+        # Add a download button for all text
+        st.download_button(
+            label="Download All Text",
+            data=all_text,
+            file_name="all_text.txt",
+            mime="text/plain"
+        )
+    else:
+        st.info("No text was extracted from the document.")
+
+@st.fragment
+def render_tables_tab(results):
+    """Render the extracted tables tab."""
+    st.header("Extracted Tables")
+    if results['tables']:
+        st.info(f"Showing all extracted tables ({len(results['tables'])} tables found)")
+
+        # Display all tables with separators
+        for i, table in enumerate(results['tables']):
+            st.markdown(f"### Page {table['page']} - Table {table['table_num']}")
+            st.dataframe(table.get('arrow_table', table['dataframe']), use_container_width=True)
+
+            # Download button for each table's CSV
+            st.download_button(
+                label=f"Download Table {i+1} as CSV",
+                data=table['csv_bytes'],
+                file_name=f"page{table['page']}_table{table['table_num']}.csv",
+                mime="text/csv",
+                key=f"download_table_{i}"
+            )
+            st.markdown("---")
+    else:
+        st.info("No tables found in the document.")
+
+@st.fragment
+def render_images_tab(results, file_hash):
+    """Render the images and OCR text tab."""
+    st.header("Images & OCR Text")
+
+    if results['images'] or results['ocr_text']:
+        # Create columns for images and OCR text
+        col1, col2 = st.columns(2)
+
+        # Handle images
+        with col1:
+            st.subheader("Images")
+            if results['images']:
+                st.info(f"Showing all extracted images ({len(results['images'])} images found)")
+
+                # Display all images with captions
+                for i, img_item in enumerate(results['images']):
+                    st.image(img_item['display_bytes'], use_column_width=True, 
+                             caption=f"Page {img_item['page']} - Image {i+1}")
+                    st.markdown("---")
+            else:
+                st.info("No images were extracted from the document.")
+
+        # Handle OCR text
+        with col2:
+            st.subheader("OCR Text")
+            if results['ocr_text']:
+                st.info(f"OCR performed using {OCR_ENGINE_NAMES[results['ocr_engine']]}.")
+
+                st.info(f"Showing all OCR text ({len(results['ocr_text'])} pages)")
+
+                # Combine all OCR text with page separators
+                all_ocr = combine_pages(file_hash, " OCR TEXT", results['ocr_text'])
+
+                st.text_area(
+                    label="All OCR Content",
+                    value=all_ocr,
+                    height=600,
+                    key="all_ocr_content"
+                )
+
+                # Add a download button for all OCR text
+                st.download_button(
+                    label="Download All OCR Text",
+                    data=all_ocr,
+                    file_name="all_ocr_text.txt",
+                    mime="text/plain"
+                )
+            else:
+                if parser.ocr_engine is None:
+                    st.warning("""
+                    OCR is disabled because neither tesserocr, pytesseract nor PyMuPDF OCR is properly configured.
+
+                    To enable OCR:
+                    1. Install tesserocr (`pip install tesserocr`) or pytesseract (`pip install pytesseract`) and install Tesseract OCR
+                    OR
+                    2. Set the TESSDATA_PREFIX environment variable for PyMuPDF OCR
+                    """)
+                elif not results['ocr_run']:
+                    st.info("OCR was skipped because this document already contains a full text layer.")
+                else:
+                    st.info("No OCR text was extracted from this document.")
+    else:
+        st.info("No images or OCR text were extracted from the document.")
 
 # File uploader
 uploaded_file = st.file_uploader("Upload a PDF file", type=['pdf'])
 
 if uploaded_file is not None:
-    # Create temporary directory for processing
-    with tempfile.TemporaryDirectory() as temp_dir:
-        # Save uploaded file
-        pdf_path = os.path.join(temp_dir, uploaded_file.name)
-        with open(pdf_path, 'wb') as f:
-            f.write(uploaded_file.getbuffer())
-        
-        # Process PDF
-        with st.spinner("Processing PDF..."):
-            try:
-                results = parser.process_pdf(pdf_path)
-                
-                # Save results to a temporary directory
-                output_dir = os.path.join(temp_dir, 'output')
-                parser.save_results(results, output_dir)
-                
-                # Display results in tabs
-                tab1, tab2, tab3, tab4 = st.tabs(["Metadata", "Text", "Tables", "Images & OCR"])
-                
-                with tab1:
-                    st.header("Document Metadata")
-                    metadata_df = pd.DataFrame.from_dict(results['metadata'], orient='index', columns=['Value'])
-                    metadata_df.index.name = 'Property'
-                    st.dataframe(metadata_df, use_container_width=True)
-                
-                with tab2:
-                    st.header("Extracted Text")
-                    if results['text']:
-                        if has_pymupdf4llm:
-                            st.success("Text extracted using enhanced PyMuPDF4LLM for better formatting and layout preservation.")
-                        
-                        st.info(f"Showing all extracted text from {len(results['text'])} pages")
-                        
-                        # Display all pages in a single scrollable container with page separators
-                        all_text = ""
-                        for i, text_item in enumerate(results['text']):
-                            all_text += f"--- PAGE {text_item['page']} ---\n\n"
-                            all_text += text_item['content']
-                            all_text += "\n\n"
-                        
-                        st.text_area(
-                            label="All Text Content",
-                            value=all_text,
-                            height=600,
-                            key="all_text_content"
-                        )
-                        
-                        # Add a download button for all text
-                        st.download_button(
-                            label="Download All Text",
-                            data=all_text,
-                            file_name="all_text.txt",
-                            mime="text/plain"
-                        )
-                    else:
-                        st.info("No text was extracted from the document.")
+    # Hash each upload once; later reruns (e.g. download clicks) reuse the digest
+    if st.session_state.get('upload_file_id') != uploaded_file.file_id:
+        st.session_state['upload_hash'] = hash_upload(uploaded_file)
+        st.session_state['upload_file_id'] = uploaded_file.file_id
+    file_hash = st.session_state['upload_hash']
+    
+    try:
+        # Run the pipeline and build the downloads only once per upload;
+        # later reruns (tab clicks, downloads) read them from session state
+        if st.session_state.get('pdf_hash') != file_hash:
+            # Process PDF, showing how many pages are done as the workers finish them
+            with st.status("Processing PDF...", expanded=True) as status:
+                progress_bar = st.progress(0.0)
                 
-                with tab3:
-                    st.header("Extracted Tables")
-                    if results['tables']:
-                        st.info(f"Showing all extracted tables ({len(results['tables'])} tables found)")
-                        
-                        # Display all tables with separators
-                        for i, table in enumerate(results['tables']):
-                            st.markdown(f"### Page {table['page']} - Table {table['table_num']}")
-                            st.dataframe(table['dataframe'], use_container_width=True)
-                            
-                            # Download button for each table's CSV
-                            csv_path = os.path.join(output_dir, 'tables', f"page_{table['page']}_table_{table['table_num']}.csv")
-                            if os.path.exists(csv_path):
-                                with open(csv_path, 'rb') as f:
-                                    st.download_button(
-                                        label=f"Download Table {i+1} as CSV",
-                                        data=f,
-                                        file_name=f"page{table['page']}_table{table['table_num']}.csv",
-                                        mime="text/csv",
-                                        key=f"download_table_{i}"
-                                    )
-                            st.markdown("---")
-                    else:
-                        st.info("No tables found in the document.")
+                def report_progress(done, total, stage):
+                    progress_bar.progress(done / total if total else 1.0, text=f"{stage}: {done}/{total}")
                 
-                with tab4:
-                    st.header("Images & OCR Text")
-                    
-                    if results['images'] or results['ocr_text']:
-                        # Create columns for images and OCR text
-                        col1, col2 = st.columns(2)
-                        
-                        # Handle images
-                        with col1:
-                            st.subheader("Images")
-                            if results['images']:
-                                st.info(f"Showing all extracted images ({len(results['images'])} images found)")
-                                
-                                # Display all images with captions
-                                for i, img_item in enumerate(results['images']):
-                                    st.image(img_item['image'], use_column_width=True, 
-                                             caption=f"Page {img_item['page']} - Image {i+1}")
-                                    st.markdown("---")
-                            else:
-                                st.info("No images were extracted from the document.")
-                        
-                        # Handle OCR text
-                        with col2:
-                            st.subheader("OCR Text")
-                            if results['ocr_text']:
-                                if parser.has_pymupdf_ocr:
-                                    st.success("OCR performed using PyMuPDF's built-in OCR engine.")
-                                else:
-                                    st.info("OCR performed using pytesseract.")
-                                
-                                st.info(f"Showing all OCR text ({len(results['ocr_text'])} pages)")
-                                
-                                # Combine all OCR text with page separators
-                                all_ocr = ""
-                                for i, ocr_item in enumerate(results['ocr_text']):
-                                    all_ocr += f"--- PAGE {ocr_item['page']} OCR TEXT ---\n\n"
-                                    all_ocr += ocr_item['content']
-                                    all_ocr += "\n\n"
-                                
-                                st.text_area(
-                                    label="All OCR Content",
-                                    value=all_ocr,
-                                    height=600,
-                                    key="all_ocr_content"
-                                )
-                                
-                                # Add a download button for all OCR text
-                                st.download_button(
-                                    label="Download All OCR Text",
-                                    data=all_ocr,
-                                    file_name="all_ocr_text.txt",
-                                    mime="text/plain"
-                                )
-                            else:
-                                if not has_pytesseract and not parser.has_pymupdf_ocr:
-                                    st.warning("""
-                                    OCR is disabled because neither pytesseract nor PyMuPDF OCR is properly configured.
-                                    
-                                    To enable OCR:
-                                    1. Install pytesseract: `pip install pytesseract` and install Tesseract OCR
-                                    OR
-                                    2. Set the TESSDATA_PREFIX environment variable for PyMuPDF OCR
-                                    """)
-                                else:
-                                    st.info("No OCR text was extracted from this document.")
-                    else:
-                        st.info("No images or OCR text were extracted from the document.")
+                results = process_pdf_cached(file_hash, uploaded_file, report_progress)
+                zip_bytes = build_results_zip(results)
+                st.session_state['results'] = results
+                st.session_state['metadata_df'] = build_metadata_df(results['metadata'])
+                st.session_state['zip_bytes'] = zip_bytes
+                st.session_state['pdf_hash'] = file_hash
+                status.update(label="PDF processed", state="complete", expanded=False)
+        
+        results = st.session_state['results']
+        zip_bytes = st.session_state['zip_bytes']
+        
+        # Display results in tabs
+        tab1, tab2, tab3, tab4 = st.tabs(["Metadata", "Text", "Tables", "Images & OCR"])
+        
+        with tab1:
+            render_metadata_tab(st.session_state['metadata_df'])
+        
+        with tab2:
+            render_text_tab(results, file_hash)
+        
+        with tab3:
+            render_tables_tab(results)
+        
+        with tab4:
+            render_images_tab(results, file_hash)
+        
+        # Add download buttons for all extracted content
+        if any([results['text'], results['tables'], results['images'], results['ocr_text']]):
+            st.header("Download Results")
+            
+            st.download_button(
+                label="Download All Results",
+                data=zip_bytes,
+                file_name=f"{Path(uploaded_file.name).stem}_results.zip",
+                mime="application/zip"
+            )
                 
-                # Add download buttons for all extracted content
-                if any([results['text'], results['tables'], results['images'], results['ocr_text']]):
-                    st.header("Download Results")
-                    
-                    # Create a zip file containing all results
-                    results_zip = shutil.make_archive(
-                        os.path.join(temp_dir, 'results'), 
-                        'zip', 
-                        output_dir
-                    )
-                    
-                    with open(results_zip, 'rb') as f:
-                        st.download_button(
-                            label="Download All Results",
-                            data=f,
-                            file_name=f"{Path(uploaded_file.name).stem}_results.zip",
-                            mime="application/zip"
-                        )
-                    
-            except Exception as e:
-                st.error(f"Error processing PDF: {str(e)}")
-                st.error("Please make sure all dependencies are installed properly.")
+    except Exception as e:
+        st.error(f"Error processing PDF: {str(e)}")
+        st.error("Please make sure all dependencies are installed properly.")
 else:
     st.info("Please upload a PDF file to begin.")
 
@@ -279,14 +390,17 @@ with st.sidebar:
     # Add OCR information section
     st.header("OCR Information")
     st.info("""
-    This app supports two OCR methods:
+    This app supports three OCR methods, used in this order:
     
-    1. PyMuPDF's built-in OCR (recommended)
-       - Requires TESSDATA_PREFIX environment variable
-       - More efficient and integrated
+    1. tesserocr (recommended)
+       - Requires tesserocr and Tesseract OCR installed
+       - Keeps the Tesseract engine loaded between pages
     
-    2. Pytesseract (fallback)
+    2. Pytesseract
        - Requires pytesseract and Tesseract OCR installed
+    
+    3. PyMuPDF's built-in OCR (fallback)
+       - Requires TESSDATA_PREFIX environment variable
        
     At least one of these methods must be configured for OCR to work.
     """)
@@ -9,7 +9,6 @@ It also checks for the presence of optional dependencies and displays messages a
 import subprocess
 import sys
 import importlib
-import os
 
 def check_dependency(module_name):
     """Check if a Python module is installed."""
@@ -24,11 +23,6 @@ def main():
     print("Starting PDF Parser application...")
     
     # Check for optional dependencies
-    if not check_dependency('pdf2image'):
-        print("Note: pdf2image is not installed. Using fallback image extraction method.")
-        print("To install: pip install pdf2image")
-        print("You'll also need Poppler installed on your system.")
-        
     if not check_dependency('pytesseract'):
         print("Note: pytesseract is not installed. OCR functionality will be disabled.")
         print("To install: pip install pytesseract")
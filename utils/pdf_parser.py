@@ -2,14 +2,27 @@ import os
 import fitz  # PyMuPDF
 import pdfplumber
 import io
+import functools
+import hashlib
 import pandas as pd
 import logging
-import sys
-from PIL import Image
+import multiprocessing
+import queue
+import shlex
+import subprocess
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from PIL import Image, ImageChops, ImageFilter
+
+# Keep each Tesseract instance single-threaded; pages are OCR'd concurrently instead.
+# Set at import, before Tesseract is loaded, so spawned pool workers inherit it too
+os.environ.setdefault('OMP_THREAD_LIMIT', '1')
 
 # Try importing pdf2image and pytesseract, but handle if they're not available
 try:
-    from pdf2image import convert_from_path
+    from pdf2image import convert_from_bytes, convert_from_path
     HAS_PDF2IMAGE = True
 except (ImportError, ModuleNotFoundError):
     HAS_PDF2IMAGE = False
@@ -20,6 +33,27 @@ try:
 except (ImportError, ModuleNotFoundError):
     HAS_PYTESSERACT = False
 
+# Try importing tesserocr, which keeps the Tesseract engine loaded between pages
+try:
+    import tesserocr
+    HAS_TESSEROCR = True
+    TESSEROCR_MAIN_THREAD_ONLY = False
+except ValueError:
+    # Its cysignals dependency raises ValueError when first imported off the main thread,
+    # e.g. from a Streamlit script thread; it still loads in the (spawned) pool workers
+    HAS_TESSEROCR = False
+    TESSEROCR_MAIN_THREAD_ONLY = True
+except (ImportError, ModuleNotFoundError):
+    HAS_TESSEROCR = False
+    TESSEROCR_MAIN_THREAD_ONLY = False
+
+# Try importing pyarrow (shipped with Streamlit) to pre-convert tables for display
+try:
+    import pyarrow as pa
+    HAS_PYARROW = True
+except (ImportError, ModuleNotFoundError):
+    HAS_PYARROW = False
+
 # Try importing pymupdf4llm for enhanced text extraction
 try:
     import pymupdf4llm
@@ -30,46 +64,289 @@ except (ImportError, ModuleNotFoundError):
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Page ranges handed out per worker process; more than one lets workers that
+# finish early (e.g. on born-digital pages) pick up pages a busier worker would OCR
+TASKS_PER_WORKER = 2
+
+# Files process_many reads ahead of the one being processed
+READ_AHEAD_FILES = 4
+
+# Pipeline tuning: pages buffered between stages, and OCR batch size / max wait in seconds
+PIPELINE_QUEUE_SIZE = 8
+OCR_BATCH_SIZE = 4
+OCR_BATCH_TIMEOUT = 0.5
+
+# Pages with more than this many characters of embedded plain text have a real text
+# layer, so OCR is skipped for them; low enough to cover title pages and slides,
+# above the stray page numbers some scanners stamp onto image-only pages
+PAGE_TEXT_MIN_CHARS = 20
+# Default render resolution for pages that are OCR'd; enough for printed 10pt text,
+# and OCR time grows with the pixel count, i.e. with the square of the DPI
+OCR_DPI = 150
+# Render resolution for pages that are not OCR'd, whose images are only previews; a
+# US Letter page at 100 DPI still fits DISPLAY_MAX_SIZE without downscaling
+PREVIEW_DPI = 100
+
+# Metadata fields reported in the results, with the PyMuPDF metadata key each is read from
+METADATA_KEYS = (
+    ('title', 'title'),
+    ('author', 'author'),
+    ('subject', 'subject'),
+    ('creator', 'creator'),
+    ('producer', 'producer'),
+    ('creation_date', 'creationDate'),
+    ('modification_date', 'modDate'),
+)
+
+# Largest (width, height) of the page images kept in the results
+DISPLAY_MAX_SIZE = (1200, 1600)
+# Pages with at most this many colours are displayed as PNG, others as JPEG
+# (anti-aliased black text alone yields up to 256 grey levels)
+DISPLAY_PNG_MAX_COLORS = 256
+
+# Tesseract settings: the LSTM engine only (OEM 1), reading each page as one block of text (PSM 6)
+TESSERACT_OEM = 1
+TESSERACT_PSM = 6
+# Tesseract variables set for every run; pages are binarized to dark text on white
+# before OCR, so the pass that retries lines as inverted (light on dark) text is wasted
+TESSERACT_VARIABLES = {'tessedit_do_invert': '0'}
+# Optional folder holding the "fast" traineddata models (tessdata_fast), which are
+# about 3x faster than the default models with little accuracy loss on clean text
+TESSDATA_FAST_DIR = os.environ.get('TESSDATA_FAST_PREFIX')
+
+# Adaptive thresholding before OCR: a pixel is text when it is at least
+# OCR_THRESHOLD_OFFSET grey levels darker than the mean of its block x block neighbourhood
+OCR_THRESHOLD_BLOCK = 31
+OCR_THRESHOLD_OFFSET = 10
+
+# Number of OCR results remembered per process, keyed by a hash of the page pixels
+OCR_CACHE_SIZE = 256
+
+# PyMuPDF is not thread-safe, so every fitz call made from a pipeline thread holds this lock
+_fitz_lock = threading.Lock()
+
+# One tesserocr API per OCR thread, reused for every page that thread handles
+_tess_local = threading.local()
+_ocr_executor = None
+
+# Recently recognized pages (least recently used first), so repeated pages are OCR'd once
+_ocr_cache = OrderedDict()
+_ocr_cache_lock = threading.Lock()
+
+def _get_tess_api():
+    """Return the tesserocr API of the current thread, creating it on first use."""
+    api = getattr(_tess_local, 'api', None)
+    if api is None:
+        kwargs = {'path': os.path.join(TESSDATA_FAST_DIR, '')} if TESSDATA_FAST_DIR else {}
+        api = tesserocr.PyTessBaseAPI(
+            lang='eng',
+            # tesserocr's OEM and PSM are enum classes that take their members' int values
+            oem=TESSERACT_OEM,
+            psm=TESSERACT_PSM,
+            variables=TESSERACT_VARIABLES,
+            **kwargs
+        )
+        _tess_local.api = api
+    return api
+
+def _get_ocr_executor(max_workers):
+    """Return the process-wide OCR thread pool so its threads (and their APIs) stay alive."""
+    global _ocr_executor
+    if _ocr_executor is None:
+        _ocr_executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='ocr')
+    return _ocr_executor
+
+def _reset_ocr_state():
+    """Drop OCR threads inherited from the parent process; they do not survive a fork."""
+    global _ocr_executor, _tess_local, _fitz_lock, _ocr_cache_lock
+    _ocr_executor = None
+    _tess_local = threading.local()
+    _fitz_lock = threading.Lock()
+    _ocr_cache_lock = threading.Lock()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_ocr_state)
+
+def _tesseract_args():
+    """Return the command-line options passed to every tesseract run."""
+    args = ['--oem', str(TESSERACT_OEM), '--psm', str(TESSERACT_PSM)]
+    for name, value in TESSERACT_VARIABLES.items():
+        args += ['-c', f'{name}={value}']
+    if TESSDATA_FAST_DIR:
+        args += ['--tessdata-dir', TESSDATA_FAST_DIR]
+    return args
+
+def _tesseract_ocr(image, engine):
+    """Run Tesseract on a PIL image with tesserocr or, for any other engine, pytesseract."""
+    if engine == 'tesserocr':
+        api = _get_tess_api()
+        api.SetImage(image)
+        return api.GetUTF8Text()
+    return pytesseract.image_to_string(image, config=' '.join(shlex.quote(arg) for arg in _tesseract_args()))
+
+def _tesseract_list_ocr(images):
+    """
+    OCR PIL images with one tesseract run over a list file, splitting its output on form feeds.
+    
+    Returns None if the output does not split into one text per image.
+    """
+    with tempfile.TemporaryDirectory() as batch_dir:
+        image_paths = []
+        for idx, image in enumerate(images):
+            image_path = os.path.join(batch_dir, f"page_{idx}.png")
+            image.save(image_path, compress_level=1)
+            image_paths.append(image_path)
+        
+        list_path = os.path.join(batch_dir, 'pages.txt')
+        with open(list_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(image_paths) + '\n')
+        
+        proc = subprocess.run(
+            [pytesseract.pytesseract.tesseract_cmd, list_path, 'stdout', *_tesseract_args()],
+            capture_output=True,
+            check=True
+        )
+    
+    # Tesseract ends every page of a multi-image run with a form feed
+    texts = proc.stdout.decode('utf-8', errors='replace').split('\f')
+    if len(texts) < len(images):
+        return None
+    return texts[:len(images)]
+
+def _preprocess_for_ocr(image):
+    """Binarize a page image to dark text on white, which Tesseract reads faster and more reliably."""
+    gray = image.convert('L')
+    local_mean = gray.filter(ImageFilter.BoxBlur(OCR_THRESHOLD_BLOCK // 2))
+    darkness = ImageChops.subtract(local_mean, gray)
+    return darkness.point(lambda value: 0 if value >= OCR_THRESHOLD_OFFSET else 255)
+
+def _warm_file(path):
+    """Read a whole file without keeping it, so it is in the OS page cache when opened."""
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"PDF file not found: {path}")
+    with open(path, 'rb') as f:
+        while f.read(1024 * 1024):
+            pass
+
+def _open_fitz(source):
+    """Open a PDF given as a file path or as raw bytes with PyMuPDF."""
+    if isinstance(source, (bytes, bytearray)):
+        return fitz.open(stream=source, filetype='pdf')
+    return fitz.open(source)
+
+def _open_pdfplumber(source):
+    """Open a PDF given as a file path or as raw bytes with pdfplumber."""
+    if isinstance(source, (bytes, bytearray)):
+        return pdfplumber.open(io.BytesIO(source))
+    return pdfplumber.open(source)
+
+def _convert_pdf(source, **kwargs):
+    """Render a PDF given as a file path or as raw bytes with pdf2image."""
+    if isinstance(source, (bytes, bytearray)):
+        return convert_from_bytes(source, **kwargs)
+    return convert_from_path(source, **kwargs)
+
+def _encode_png(image):
+    """Encode a PIL image as PNG bytes, favouring encode speed over file size."""
+    buf = io.BytesIO()
+    image.save(buf, format='PNG', compress_level=1)
+    return buf.getvalue()
+
+def _encode_display(image, png_bytes):
+    """
+    Encode a page image for on-screen display.
+    
+    Photographic pages are sent as JPEG, which is several times smaller than
+    PNG for natural images. Pages with few distinct colours (text, line art)
+    keep their PNG encoding, which is both smaller and sharper for them.
+    """
+    if image.getcolors(maxcolors=DISPLAY_PNG_MAX_COLORS) is not None:
+        return png_bytes
+    buf = io.BytesIO()
+    image.convert('RGB').save(buf, format='JPEG', quality=82, optimize=False)
+    return buf.getvalue()
+
+@functools.cache
+def _check_pymupdf_ocr():
+    """Check once per process if PyMuPDF's OCR functionality is available."""
+    # PyMuPDF versions that cannot locate tessdata themselves need it configured; skip the probe if it is not
+    if not (os.environ.get('TESSDATA_PREFIX') or TESSDATA_FAST_DIR or hasattr(fitz, 'get_tessdata')):
+        logger.warning("PyMuPDF OCR is not available. TESSDATA_PREFIX environment variable is not set.")
+        return False
+    try:
+        # Create a small test image
+        pix = fitz.Pixmap(fitz.csRGB, 100, 100)
+        # Try to OCR it - this will raise an exception if OCR is not available
+        pix.pdfocr_tobytes(tessdata=TESSDATA_FAST_DIR)
+        return True
+    except Exception as e:
+        if "No OCR support: TESSDATA_PREFIX not set" in str(e):
+            logger.warning("PyMuPDF OCR is not available. TESSDATA_PREFIX environment variable is not set.")
+        else:
+            logger.warning(f"PyMuPDF OCR is not available: {str(e)}")
+        return False
+
+def _process_page_range(task):
+    """Pool worker: extract the contents of one page range of a PDF."""
+    parser, source, lo, hi = task
+    return parser._extract_page_range(source, lo, hi)
+
 class PDFParser:
     """Class for extracting text, tables, and images from PDF documents."""
     
-    def __init__(self):
-        """Initialize the PDF parser."""
-        if not HAS_PDF2IMAGE:
+    def __init__(self, num_workers=None, ocr_dpi=OCR_DPI, use_pdf2image=False, grayscale=False):
+        """
+        Initialize the PDF parser.
+        
+        Args:
+            num_workers (int, optional): Number of worker processes used to
+                process page ranges in parallel. Defaults to the number of
+                CPUs, capped at 4.
+            ocr_dpi (int, optional): Resolution pages are rendered at for OCR.
+                Defaults to 150.
+            use_pdf2image (bool, optional): Render pages with pdf2image (Poppler)
+                instead of PyMuPDF. PyMuPDF renders in-process and is faster;
+                Poppler runs as a separate program and passes pages through
+                temporary files. Defaults to False.
+            grayscale (bool, optional): Render pages in grayscale. OCR works on
+                grayscale anyway, so this cuts raster memory and copying
+                threefold at the cost of grey page images in the results.
+                Defaults to False.
+        """
+        self.num_workers = num_workers or min(os.cpu_count() or 1, 4)
+        self.ocr_dpi = ocr_dpi
+        self.use_pdf2image = use_pdf2image
+        self.grayscale = grayscale
+        
+        # Check if PyMuPDF OCR is available (TESSDATA_PREFIX environment variable set)
+        self.has_pymupdf_ocr = _check_pymupdf_ocr()
+        # Pick the OCR engine here, once; the parser is pickled into the worker
+        # processes, so they use the same engine as this process
+        self.ocr_engine = self._resolve_ocr_engine()
+        
+        if use_pdf2image and not HAS_PDF2IMAGE:
             logger.warning("pdf2image not available. Image extraction will use PyMuPDF instead.")
-        if not HAS_PYTESSERACT:
+        if self.ocr_engine == 'tesserocr':
+            logger.info("tesserocr is available. Using a persistent Tesseract API for OCR.")
+        elif self.ocr_engine != 'pytesseract':
             logger.warning("pytesseract not available. Using PyMuPDF's built-in OCR instead.")
         if HAS_PYMUPDF4LLM:
             logger.info("pymupdf4llm is available. Using enhanced text extraction capabilities.")
-        
-        # Check if PyMuPDF OCR is available (TESSDATA_PREFIX environment variable set)
-        self.has_pymupdf_ocr = self._check_pymupdf_ocr()
-    
-    def _check_pymupdf_ocr(self):
-        """Check if PyMuPDF's OCR functionality is available."""
-        try:
-            # Create a small test image
-            pix = fitz.Pixmap(fitz.csRGB, 100, 100)
-            # Try to OCR it - this will raise an exception if OCR is not available
-            pix.pdfocr_tobytes()
-            return True
-        except Exception as e:
-            if "No OCR support: TESSDATA_PREFIX not set" in str(e):
-                logger.warning("PyMuPDF OCR is not available. TESSDATA_PREFIX environment variable is not set.")
-            else:
-                logger.warning(f"PyMuPDF OCR is not available: {str(e)}")
-            return False
     
-    def _extract_images_pymupdf(self, pdf_doc):
-        """Extract images using PyMuPDF as fallback when pdf2image is not available."""
+    def _extract_images_pymupdf(self, pdf_doc, pages=None, dpi=OCR_DPI, colorspace=fitz.csRGB):
+        """Render pages to PIL images with PyMuPDF, in RGB or (with ``fitz.csGRAY``) grayscale."""
         images = []
+        if pages is None:
+            pages = range(len(pdf_doc))
         
-        for page_idx, page in enumerate(pdf_doc):
+        for page_idx in pages:
             # Get images from the page
             try:
-                pix = page.get_pixmap(dpi=300)
-                img_data = pix.tobytes("png")
-                img = Image.open(io.BytesIO(img_data))
+                page = pdf_doc[page_idx]
+                # Pages are opaque, so skip the alpha channel
+                pix = page.get_pixmap(dpi=dpi, colorspace=colorspace, alpha=False)
+                # Wrap the raw samples directly instead of round-tripping through PNG
+                img = Image.frombytes('L' if pix.n == 1 else 'RGB', (pix.width, pix.height), pix.samples)
                 
                 images.append({
                     'page': page_idx + 1,
@@ -84,7 +361,7 @@ class PDFParser:
         """Perform OCR using PyMuPDF's built-in OCR functionality."""
         try:
             # Convert the pixmap to a one-page PDF with OCR text embedded
-            pdfdata = page_pixmap.pdfocr_tobytes()
+            pdfdata = page_pixmap.pdfocr_tobytes(language='eng', tessdata=TESSDATA_FAST_DIR)
             
             # Open the result as a PDF document
             temp_doc = fitz.open("pdf", pdfdata)
@@ -102,14 +379,143 @@ class PDFParser:
             logger.warning(f"PyMuPDF OCR failed for page {page_num}: {str(e)}")
             return None
             
-    def _extract_text_pymupdf4llm(self, pdf_doc):
+    def ocr_pages_batch(self, images, pages=None):
+        """
+        OCR a batch of page images.
+        
+        Each image is first converted to grayscale and binarized with an
+        adaptive threshold. Pages whose pixels match a recently recognized
+        page (e.g. repeated cover or boilerplate pages, or a document that
+        is processed again) reuse its text instead of being OCR'd again.
+        
+        With tesserocr the pages are recognized concurrently by per-thread
+        engines that stay loaded between calls. With pytesseract the batch
+        is split between the OCR threads, and each share goes to a single
+        ``tesseract`` run over a list of page files, so the engine and
+        language model are loaded once per share instead of once per page.
+        Otherwise PyMuPDF's built-in OCR is used.
+        
+        Args:
+            images (list): PIL images of the pages to recognize.
+            pages (list, optional): Page numbers of the images, used in log
+                messages. Defaults to 1..N.
+            
+        Returns:
+            list: Recognized text of each image, in order ('' where OCR failed).
+        """
+        if pages is None:
+            pages = list(range(1, len(images) + 1))
+        if not images:
+            return []
+        images = [_preprocess_for_ocr(image) for image in images]
+        keys = [(image.size, hashlib.blake2b(image.tobytes(), digest_size=16).digest()) for image in images]
+        
+        with _ocr_cache_lock:
+            texts = [_ocr_cache.get(key) for key in keys]
+            for key, text in zip(keys, texts):
+                if text is not None:
+                    _ocr_cache.move_to_end(key)
+        
+        # OCR each distinct uncached page once, even if it repeats within the batch
+        pending = {}
+        for idx, (key, text) in enumerate(zip(keys, texts)):
+            if text is None:
+                pending.setdefault(key, idx)
+        if pending:
+            idxs = list(pending.values())
+            new_texts = dict(zip(pending, self._ocr_uncached([images[idx] for idx in idxs], [pages[idx] for idx in idxs])))
+            with _ocr_cache_lock:
+                for key, text in new_texts.items():
+                    # An empty result may be a failed OCR run, so only real text is remembered
+                    if text.strip():
+                        _ocr_cache[key] = text
+                while len(_ocr_cache) > OCR_CACHE_SIZE:
+                    _ocr_cache.popitem(last=False)
+            texts = [new_texts[key] if text is None else text for key, text in zip(keys, texts)]
+        return texts
+    
+    def _ocr_uncached(self, images, pages):
+        """OCR preprocessed page images with the parser's OCR engine."""
+        if self.ocr_engine == 'tesserocr':
+            return self._ocr_images(images, pages)
+        if self.ocr_engine == 'pytesseract':
+            return self._ocr_images_tesseract_batch(images, pages)
+        if self.ocr_engine == 'pymupdf':
+            return self._ocr_images_pymupdf(images, pages)
+        return [''] * len(images)
+    
+    def _ocr_threads(self):
+        """Return the number of OCR threads per worker process, its share of the cores."""
+        return max(1, (os.cpu_count() or 1) // self.num_workers)
+    
+    def _ocr_images(self, images, pages):
+        """OCR page images concurrently, one Tesseract instance per thread."""
+        executor = _get_ocr_executor(self._ocr_threads())
+        futures = [executor.submit(_tesseract_ocr, image, self.ocr_engine) for image in images]
+        
+        texts = []
+        for page_num, future in zip(pages, futures):
+            try:
+                texts.append(future.result())
+            except Exception as e:
+                logger.warning(f"OCR failed for page {page_num}: {str(e)}")
+                texts.append('')
+        return texts
+    
+    def _ocr_images_tesseract_batch(self, images, pages):
+        """
+        OCR page images with tesseract runs over list files.
+        
+        Each run is single-threaded (``OMP_THREAD_LIMIT=1``), so the batch is
+        split into one contiguous share per OCR thread and the shares run
+        concurrently, each as one tesseract process.
+        """
+        num_threads = self._ocr_threads()
+        executor = _get_ocr_executor(num_threads)
+        chunk_size = -(-len(images) // min(num_threads, len(images)))  # ceiling division
+        bounds = [(lo, min(lo + chunk_size, len(images))) for lo in range(0, len(images), chunk_size)]
+        futures = [executor.submit(_tesseract_list_ocr, images[lo:hi]) for lo, hi in bounds]
+        
+        texts = []
+        for (lo, hi), future in zip(bounds, futures):
+            try:
+                chunk_texts = future.result()
+                if chunk_texts is None:
+                    logger.warning(
+                        "Batched tesseract output does not match the page count. OCRing pages one by one instead."
+                    )
+            except Exception as e:
+                logger.warning(f"Batched tesseract run failed: {str(e)}. OCRing pages one by one instead.")
+                chunk_texts = None
+            if chunk_texts is None:
+                # Pages that fail here too come back as ''
+                chunk_texts = self._ocr_images(images[lo:hi], pages[lo:hi])
+            texts.extend(chunk_texts)
+        return texts
+    
+    def _ocr_images_pymupdf(self, images, pages):
+        """OCR page images with PyMuPDF's built-in OCR."""
+        texts = []
+        for image, page_num in zip(images, pages):
+            gray = image.convert('L')
+            pix = fitz.Pixmap(fitz.csGRAY, gray.width, gray.height, gray.tobytes(), False)
+            with _fitz_lock:
+                ocr_result = self._perform_pymupdf_ocr(pix, page_num)
+            texts.append(ocr_result['content'] if ocr_result else '')
+        return texts
+            
+    def _extract_text_pymupdf4llm(self, pdf_doc, pages=None):
         """Extract text using pymupdf4llm for enhanced markdown-formatted text."""
         text_results = []
+        if pages is None:
+            pages = range(len(pdf_doc))
+        pages = list(pages)
         
         try:
-            for page_num in range(len(pdf_doc)):
-                # Extract text with pymupdf4llm (returns markdown formatted text)
-                text = pymupdf4llm.get_page_markdown(pdf_doc, page_num)
+            # Convert all pages in one call so pymupdf4llm sets up its font and style analysis once
+            chunks = pymupdf4llm.to_markdown(pdf_doc, pages=pages, page_chunks=True, show_progress=False)
+            for page_num, chunk in zip(pages, chunks):
+                text = chunk['text']
                 
                 if text.strip():
                     text_results.append({
@@ -122,130 +528,477 @@ class PDFParser:
             
         return text_results
         
-    def process_pdf(self, pdf_path):
+    def _page_ranges(self, page_count):
+        """Split the page indices of a document into contiguous (lo, hi) ranges for the workers."""
+        if page_count <= 0:
+            return []
+        # A single worker gains nothing from a pool, so it processes the document in-process
+        if self.num_workers == 1:
+            return [(0, page_count)]
+        num_chunks = max(1, min(self.num_workers * TASKS_PER_WORKER, page_count))
+        chunk_size = -(-page_count // num_chunks)  # ceiling division
+        return [(lo, min(lo + chunk_size, page_count)) for lo in range(0, page_count, chunk_size)]
+    
+    def _resolve_ocr_engine(self):
+        """Return the OCR engine to use: 'tesserocr', 'pytesseract', 'pymupdf' or None if OCR is unavailable."""
+        if HAS_TESSEROCR or TESSEROCR_MAIN_THREAD_ONLY:
+            return 'tesserocr'
+        if HAS_PYTESSERACT:
+            return 'pytesseract'
+        if self.has_pymupdf_ocr:
+            return 'pymupdf'
+        return None
+    
+    def _extract_page_text(self, pdf_doc, page_num, markdown=None):
+        """
+        Extract the text of one page, preferring pymupdf4llm over plain PyMuPDF.
+        
+        ``markdown`` maps page indices to pymupdf4llm text items extracted
+        beforehand for a batch of pages; pages missing from it fall back
+        to plain PyMuPDF text.
+        
+        Returns:
+            tuple: The text items of the page, and the number of characters
+            in its plain text layer (markdown markup would inflate the count).
+        """
+        text = pdf_doc[page_num].get_text()
+        text_chars = len(text.strip())
+        
+        # Use the enhanced pymupdf4llm text if it was extracted for this page
+        if markdown and page_num in markdown:
+            return [markdown[page_num]], text_chars
+        
+        # Fall back to regular PyMuPDF text extraction if needed
+        if text_chars:
+            return [{
+                'page': page_num + 1,
+                'content': text
+            }], text_chars
+        return [], text_chars
+    
+    def _extract_page_tables(self, pdf, page_num):
+        """Extract the tables of one page using pdfplumber."""
+        table_results = []
+        try:
+            tables = pdf.pages[page_num].extract_tables()
+            for table_num, table in enumerate(tables):
+                if table:  # Skip empty tables
+                    # Convert table to pandas DataFrame (from_records skips the generic constructor's type dispatch)
+                    if table[0]:  # If table has headers
+                        df = pd.DataFrame.from_records(table[1:], columns=table[0])
+                    else:
+                        df = pd.DataFrame.from_records(table)
+                        
+                    table_item = {
+                        'page': page_num + 1,
+                        'table_num': table_num + 1,
+                        'dataframe': df,
+                        'csv_bytes': df.to_csv(index=False).encode('utf-8')
+                    }
+                    
+                    # Convert to Arrow once so displaying the table does not redo it
+                    if HAS_PYARROW:
+                        try:
+                            table_item['arrow_table'] = pa.Table.from_pandas(df, preserve_index=False)
+                        except Exception as e:
+                            # Expected for empty or duplicate header cells (e.g. merged headers);
+                            # such tables are displayed from the DataFrame instead
+                            logger.debug(f"Table {table_num + 1} on page {page_num + 1} stays a DataFrame: {str(e)}")
+                    
+                    table_results.append(table_item)
+        except Exception as e:
+            logger.warning(f"Error extracting tables from page {page_num + 1}: {str(e)}")
+        return table_results
+    
+    def _render_stage(self, source, pages, render_q, ocr=True):
+        """Pipeline stage 1: extract the text of each page, render it, and queue both for parsing."""
+        doc = None
+        colorspace = fitz.csGRAY if self.grayscale else fitz.csRGB
+        try:
+            with _fitz_lock:
+                doc = _open_fitz(source)
+            
+            with tempfile.TemporaryDirectory() as image_dir:
+                # Render with pdf2image only when asked to; each page is rendered once either way
+                poppler_images = {}
+                if self.use_pdf2image and HAS_PDF2IMAGE and ocr:
+                    try:
+                        # Let Poppler rasterize several pages at once and write them to a
+                        # temporary folder instead of piping every page through memory.
+                        # Note: on macOS many concurrent pdftoppm threads can exhaust the
+                        # open file limit; raise it with `ulimit -n 10000` if needed.
+                        render_threads = max(1, ((os.cpu_count() or 2) - 1) // self.num_workers)
+                        images = _convert_pdf(
+                            source,
+                            first_page=pages.start + 1,
+                            last_page=pages.stop,
+                            dpi=self.ocr_dpi,
+                            grayscale=self.grayscale,
+                            thread_count=render_threads,
+                            output_folder=image_dir
+                        )
+                        poppler_images = dict(zip(pages, images))
+                    except Exception as e:
+                        logger.warning(f"Error extracting images with pdf2image: {str(e)}. Will try PyMuPDF instead.")
+                
+                # Visit each page once: extract its text and, unless pdf2image
+                # already rendered it, render it while the page is loaded. Pages
+                # with a text layer are not OCR'd, so a lower-resolution preview
+                # is enough for them
+                markdown = {}
+                for page_num in pages:
+                    # Convert the pages to markdown with one pymupdf4llm call per OCR batch,
+                    # so earlier pages are already being parsed and OCR'd meanwhile
+                    if HAS_PYMUPDF4LLM and (page_num - pages.start) % OCR_BATCH_SIZE == 0:
+                        batch = range(page_num, min(page_num + OCR_BATCH_SIZE, pages.stop))
+                        with _fitz_lock:
+                            markdown = {item['page'] - 1: item for item in self._extract_text_pymupdf4llm(doc, batch)}
+                    
+                    image = poppler_images.pop(page_num, None)
+                    if image is not None:
+                        # Read the page into memory before its file is removed
+                        image.load()
+                    with _fitz_lock:
+                        text_items, text_chars = self._extract_page_text(doc, page_num, markdown)
+                        # OCR only pages whose embedded text layer is missing or sparse
+                        needs_ocr = ocr and text_chars <= PAGE_TEXT_MIN_CHARS
+                        if image is None:
+                            dpi = self.ocr_dpi if needs_ocr else PREVIEW_DPI
+                            images = self._extract_images_pymupdf(doc, [page_num], dpi=dpi, colorspace=colorspace)
+                            image = images[0]['image'] if images else None
+                    render_q.put((page_num, text_items, needs_ocr, image))
+        except Exception as e:
+            logger.warning(f"Error extracting text and images: {str(e)}")
+        finally:
+            if doc is not None:
+                with _fitz_lock:
+                    doc.close()
+            render_q.put(None)
+    
+    def _parse_stage(self, render_q, ocr_q, part):
+        """Pipeline stage 2: collect the text and images of each page and queue the images for OCR."""
+        item = ()
+        try:
+            while True:
+                item = render_q.get()
+                if item is None:
+                    break
+                page_num, text_items, needs_ocr, image = item
+                
+                part['text'].extend(text_items)
+                
+                if image is not None:
+                    # OCR the full-resolution render, but keep a downscaled copy for display
+                    if ocr_q is not None and needs_ocr:
+                        ocr_q.put({
+                            'page': page_num + 1,
+                            'image': image
+                        })
+                        part['ocr_run'] = True
+                    display = image.copy()
+                    display.thumbnail(DISPLAY_MAX_SIZE, Image.LANCZOS)
+                    png_bytes = _encode_png(display)
+                    part['images'].append({
+                        'page': page_num + 1,
+                        'image': display,
+                        'png_bytes': png_bytes,
+                        'display_bytes': _encode_display(display, png_bytes)
+                    })
+        except Exception as e:
+            logger.warning(f"Error encoding page images: {str(e)}")
+            # Keep draining so the render stage never blocks on a full queue
+            while item is not None:
+                item = render_q.get()
+        finally:
+            if ocr_q is not None:
+                ocr_q.put(None)
+    
+    def _table_stage(self, source, pages, part):
+        """Side stage: extract the tables of every page with pdfplumber, independently of rendering."""
+        try:
+            with _open_pdfplumber(source) as pdf:
+                for page_num in pages:
+                    part['tables'].extend(self._extract_page_tables(pdf, page_num))
+        except Exception as e:
+            logger.warning(f"Error extracting tables: {str(e)}")
+    
+    def _ocr_stage(self, ocr_q, part):
+        """Pipeline stage 3: OCR queued page images in batches."""
+        batch = []
+        while True:
+            try:
+                img_item = ocr_q.get(timeout=OCR_BATCH_TIMEOUT)
+            except queue.Empty:
+                # Nothing new arrived in time; OCR what has been collected so far
+                self._flush_ocr_batch(batch, part)
+                continue
+            if img_item is None:
+                break
+            batch.append(img_item)
+            if len(batch) >= OCR_BATCH_SIZE:
+                self._flush_ocr_batch(batch, part)
+        self._flush_ocr_batch(batch, part)
+    
+    def _flush_ocr_batch(self, batch, part):
+        """OCR the collected page images and clear the batch."""
+        if not batch:
+            return
+        try:
+            texts = self.ocr_pages_batch(
+                [img_item['image'] for img_item in batch],
+                [img_item['page'] for img_item in batch]
+            )
+            for img_item, ocr_text in zip(batch, texts):
+                if ocr_text.strip():
+                    part['ocr_text'].append({
+                        'page': img_item['page'],
+                        'content': ocr_text
+                    })
+        except Exception as e:
+            logger.warning(f"Error performing OCR: {str(e)}")
+        batch.clear()
+    
+    def _extract_page_range(self, source, lo, hi):
+        """
+        Extract text, tables, images and OCR text for pages ``lo`` to ``hi - 1``.
+        
+        The work runs as a three-stage pipeline connected by bounded queues:
+        a render thread extracts the text of each page and rasterizes it in
+        the same visit, a parse thread collects the text and encodes the
+        images, and an OCR thread recognizes the images in batches.
+        Rendering and OCR therefore overlap instead of running one after
+        the other. A fourth thread extracts the tables with pdfplumber
+        alongside the pipeline, as it does not need the rendered pages.
+        
+        Each call reopens the PDF from its path or bytes so that it can run
+        inside a worker process (PyMuPDF and pdfplumber documents cannot be
+        pickled). A file is opened by path with both libraries, which only
+        load the parts of it they need, rather than read into memory whole.
+        
+        Args:
+            source (str or bytes): Path to the PDF file, or its contents.
+            lo (int): Index of the first page to process (0-based, inclusive).
+            hi (int): Index of the last page to process (0-based, exclusive).
+            
+        Returns:
+            dict: Dictionary with 'text', 'tables', 'images' and 'ocr_text' lists
+            for the processed pages, each item tagged with its page number, and
+            'ocr_run', whether any of the pages was sent to OCR.
+        """
+        part = {
+            'text': [],
+            'tables': [],
+            'images': [],
+            'ocr_text': [],
+            'ocr_run': False
+        }
+        pages = range(lo, hi)
+        engine = self.ocr_engine
+        
+        render_q = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        ocr_q = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE) if engine else None
+        
+        threads = [
+            threading.Thread(target=self._render_stage, args=(source, pages, render_q, bool(engine)), name='render'),
+            threading.Thread(target=self._parse_stage, args=(render_q, ocr_q, part), name='parse'),
+            threading.Thread(target=self._table_stage, args=(source, pages, part), name='tables')
+        ]
+        if engine:
+            threads.append(threading.Thread(target=self._ocr_stage, args=(ocr_q, part), name='ocr'))
+        
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        return part
+        
+    def process_pdf(self, pdf_path, progress_cb=None, pool=None):
         """
         Process a PDF file to extract metadata, text, tables, and images.
         
+        The pages are split into contiguous ranges (a few per worker, so the
+        load evens out when OCR cost differs between pages) that are processed
+        in parallel by a pool of ``num_workers`` processes, and the per-range
+        results are merged back in page order. With a single worker the
+        whole document is processed in this process instead.
+        
         Args:
             pdf_path (str): Path to the PDF file.
+            progress_cb (callable, optional): Called as
+                ``progress_cb(done, total, stage)`` each time a range of pages
+                is finished, with the number of pages done so far.
+            pool (ProcessPoolExecutor, optional): Long-lived pool to run the
+                page ranges on, e.g. from :meth:`create_worker_pool`. It is
+                left running afterwards. By default a pool is created for
+                this call and shut down when it returns.
             
         Returns:
             dict: Dictionary containing extracted PDF components.
         """
         if not os.path.exists(pdf_path):
             raise FileNotFoundError(f"PDF file not found: {pdf_path}")
+        
+        return self._process_source(pdf_path, pdf_path, progress_cb, pool)
+    
+    def process_pdf_bytes(self, data, progress_cb=None, pool=None):
+        """
+        Process an in-memory PDF to extract metadata, text, tables, and images.
+        
+        Same as :meth:`process_pdf`, but the document is read from ``data``
+        directly, so callers holding the file contents (e.g. an upload) do
+        not need to write it to disk first. When the pages are spread over
+        worker processes, the contents are written to one temporary file
+        that the workers open, rather than sent to each of them.
+        
+        Args:
+            data (bytes): Contents of the PDF file.
+            progress_cb (callable, optional): Progress callback, as for
+                :meth:`process_pdf`.
+            pool (ProcessPoolExecutor, optional): Worker pool, as for
+                :meth:`process_pdf`.
             
+        Returns:
+            dict: Dictionary containing extracted PDF components.
+        """
+        return self._process_source(bytes(data), '<bytes>', progress_cb, pool)
+    
+    def process_many(self, pdf_paths, pool=None):
+        """
+        Process several PDF files, reading upcoming files in the background.
+        
+        While one document is being processed, up to ``READ_AHEAD_FILES``
+        of the following files are read by background threads, so they are
+        already in the OS page cache when the workers open them and their
+        disk reads overlap with the extraction instead of adding to it.
+        Only the paths are sent to the workers. All documents share one
+        worker pool.
+        
+        Args:
+            pdf_paths (list): Paths to the PDF files.
+            pool (ProcessPoolExecutor, optional): Worker pool, as for
+                :meth:`process_pdf`. By default one pool is created for the
+                whole batch.
+            
+        Returns:
+            list: Dictionary of extracted PDF components for each path, in order.
+        """
+        pdf_paths = list(pdf_paths)
+        # Spawned workers, as the read-ahead threads would be running during a fork
+        executor = pool or self.create_worker_pool()
+        all_results = []
+        try:
+            with ThreadPoolExecutor(max_workers=READ_AHEAD_FILES, thread_name_prefix='read') as reader:
+                reads = [reader.submit(_warm_file, path) for path in pdf_paths[:READ_AHEAD_FILES]]
+                for idx, path in enumerate(pdf_paths):
+                    reads[idx].result()
+                    reads[idx] = None
+                    # Keep the read-ahead window full
+                    if idx + READ_AHEAD_FILES < len(pdf_paths):
+                        reads.append(reader.submit(_warm_file, pdf_paths[idx + READ_AHEAD_FILES]))
+                    all_results.append(self._process_source(path, path, pool=executor))
+        finally:
+            if pool is None:
+                executor.shutdown()
+        return all_results
+    
+    def create_worker_pool(self):
+        """
+        Create a process pool that can be reused across documents.
+        
+        Passing the pool to :meth:`process_pdf` or :meth:`process_pdf_bytes`
+        keeps the worker processes, with PyMuPDF and the OCR bindings
+        already imported, alive between documents instead of starting new
+        ones for every call. Workers are spawned rather than forked, so the
+        pool is safe to create from a multi-threaded host such as a
+        Streamlit server.
+        
+        Returns:
+            ProcessPoolExecutor: Pool with ``num_workers`` worker processes.
+        """
+        return ProcessPoolExecutor(
+            max_workers=self.num_workers,
+            mp_context=multiprocessing.get_context('spawn')
+        )
+    
+    def _process_source(self, source, name, progress_cb=None, pool=None):
+        """Extract the contents of a PDF given as a file path or as raw bytes."""
         # Initialize results dictionary
         results = {
             'metadata': {},
             'text': [],
             'tables': [],
             'images': [],
-            'ocr_text': []
+            'ocr_text': [],
+            'ocr_run': False,
+            'ocr_engine': None
         }
         
         try:
-            # Extract metadata and text using PyMuPDF
-            with fitz.open(pdf_path) as doc:
-                results['metadata'] = {
-                    'title': doc.metadata.get('title', ''),
-                    'author': doc.metadata.get('author', ''),
-                    'subject': doc.metadata.get('subject', ''),
-                    'creator': doc.metadata.get('creator', ''),
-                    'producer': doc.metadata.get('producer', ''),
-                    'creation_date': doc.metadata.get('creationDate', ''),
-                    'modification_date': doc.metadata.get('modDate', ''),
-                    'pages': len(doc)
-                }
-                
-                # Try enhanced text extraction with pymupdf4llm if available
-                if HAS_PYMUPDF4LLM:
-                    results['text'] = self._extract_text_pymupdf4llm(doc)
-                
-                # Fall back to regular PyMuPDF text extraction if needed
-                if not results['text']:
-                    for page_num, page in enumerate(doc):
-                        text = page.get_text()
-                        if text.strip():
-                            results['text'].append({
-                                'page': page_num + 1,
-                                'content': text
-                            })
-                
-                # Extract images using PyMuPDF if pdf2image is not available
-                if not HAS_PDF2IMAGE:
-                    results['images'] = self._extract_images_pymupdf(doc)
-                
-                # Perform OCR using PyMuPDF's built-in OCR if available
-                if self.has_pymupdf_ocr and not HAS_PYTESSERACT:
-                    for page_num, page in enumerate(doc):
-                        try:
-                            # Get the page as a pixmap (image)
-                            pix = page.get_pixmap(dpi=300)
-                            
-                            # Perform OCR on the pixmap
-                            ocr_result = self._perform_pymupdf_ocr(pix, page_num + 1)
-                            if ocr_result:
-                                results['ocr_text'].append(ocr_result)
-                        except Exception as e:
-                            logger.warning(f"Error extracting OCR from page {page_num + 1}: {str(e)}")
-            
-            # Extract tables using pdfplumber
-            try:
-                with pdfplumber.open(pdf_path) as pdf:
-                    for page_num, page in enumerate(pdf.pages):
-                        try:
-                            tables = page.extract_tables()
-                            for table_num, table in enumerate(tables):
-                                if table:  # Skip empty tables
-                                    # Convert table to pandas DataFrame
-                                    if table[0]:  # If table has headers
-                                        df = pd.DataFrame(table[1:], columns=table[0])
-                                    else:
-                                        df = pd.DataFrame(table)
-                                        
-                                    results['tables'].append({
-                                        'page': page_num + 1,
-                                        'table_num': table_num + 1,
-                                        'dataframe': df
-                                    })
-                        except Exception as e:
-                            logger.warning(f"Error extracting tables from page {page_num + 1}: {str(e)}")
-            except Exception as e:
-                logger.warning(f"Error extracting tables: {str(e)}")
+            # Extract metadata using PyMuPDF (holding the lock, as another document's
+            # pipeline may be running in this process, e.g. for another Streamlit session)
+            with _fitz_lock, _open_fitz(source) as doc:
+                # Map the document's metadata onto the result keys in one pass (it is None for some encrypted files)
+                doc_metadata = doc.metadata or {}
+                results['metadata'] = {key: doc_metadata.get(source_key, '') for key, source_key in METADATA_KEYS}
+                results['metadata']['pages'] = doc.page_count
+                page_count = doc.page_count
             
-            # Extract images and perform OCR using pdf2image and pytesseract if available
-            if HAS_PDF2IMAGE:
+            # Fan the page ranges out to worker processes, reporting each range as it finishes
+            ranges = self._page_ranges(page_count)
+            parts = []
+            pages_done = 0
+            if progress_cb:
+                progress_cb(pages_done, page_count, 'Extracting pages')
+            # tesserocr that only loads in the worker processes must OCR there, even for one range
+            tesserocr_in_workers = self.ocr_engine == 'tesserocr' and not HAS_TESSEROCR
+            if ranges and (len(ranges) > 1 or tesserocr_in_workers):
+                # Spawned, not forked, workers: this process keeps OCR threads alive
+                executor = pool or self.create_worker_pool()
                 try:
-                    images = convert_from_path(pdf_path)
-                    for page_num, image in enumerate(images):
-                        # Save image for results
-                        results['images'].append({
-                            'page': page_num + 1,
-                            'image': image
-                        })
+                    with tempfile.TemporaryDirectory() as spill_dir:
+                        task_source = source
+                        if isinstance(source, (bytes, bytearray)):
+                            # Write an in-memory PDF to disk once and hand the workers its path,
+                            # instead of pickling the whole document into every task
+                            task_source = os.path.join(spill_dir, 'document.pdf')
+                            with open(task_source, 'wb') as f:
+                                f.write(source)
                         
-                        # Perform OCR if pytesseract is available
-                        if HAS_PYTESSERACT:
-                            try:
-                                ocr_text = pytesseract.image_to_string(image)
-                                if ocr_text.strip():
-                                    results['ocr_text'].append({
-                                        'page': page_num + 1,
-                                        'content': ocr_text
-                                    })
-                            except Exception as e:
-                                logger.warning(f"OCR failed for page {page_num + 1}: {str(e)}")
-                except Exception as e:
-                    logger.warning(f"Error extracting images with pdf2image: {str(e)}. Will try PyMuPDF instead.")
-                    # If pdf2image fails, try PyMuPDF as fallback for images
-                    with fitz.open(pdf_path) as doc:
-                        results['images'] = self._extract_images_pymupdf(doc)
+                        tasks = [(self, task_source, lo, hi) for lo, hi in ranges]
+                        futures = {executor.submit(_process_page_range, task): task for task in tasks}
+                        for future in as_completed(futures):
+                            parts.append(future.result())
+                            _, _, lo, hi = futures[future]
+                            pages_done += hi - lo
+                            if progress_cb:
+                                progress_cb(pages_done, page_count, 'Extracting pages')
+                finally:
+                    # A pool passed in by the caller stays up for its next document
+                    if pool is None:
+                        executor.shutdown()
+            else:
+                for lo, hi in ranges:
+                    parts.append(self._extract_page_range(source, lo, hi))
+                    pages_done += hi - lo
+                    if progress_cb:
+                        progress_cb(pages_done, page_count, 'Extracting pages')
+            
+            # Merge the per-range results, keeping them in page order
+            for part in parts:
+                for key in ('text', 'tables', 'images', 'ocr_text'):
+                    results[key].extend(part[key])
+            for key in ('text', 'images', 'ocr_text'):
+                results[key].sort(key=lambda item: item['page'])
+            results['tables'].sort(key=lambda item: (item['page'], item['table_num']))
+            # OCR is skipped page by page, so it ran if any page lacked a text layer
+            results['ocr_run'] = any(part['ocr_run'] for part in parts)
+            results['ocr_engine'] = self.ocr_engine if results['ocr_run'] else None
             
             return results
             
         except Exception as e:
-            logger.error(f"Error processing PDF {pdf_path}: {str(e)}")
+            logger.error(f"Error processing PDF {name}: {str(e)}")
             raise
 
     def save_results(self, results, output_dir):
@@ -260,18 +1013,17 @@ class PDFParser:
             os.makedirs(output_dir, exist_ok=True)
             
         try:
+            # Each text file is built in memory and written with a single call
             # Save metadata
             with open(os.path.join(output_dir, 'metadata.txt'), 'w', encoding='utf-8') as f:
-                for key, value in results['metadata'].items():
-                    f.write(f"{key}: {value}\n")
+                f.write("".join(f"{key}: {value}\n" for key, value in results['metadata'].items()))
             
             # Save extracted text
             if results['text']:
                 with open(os.path.join(output_dir, 'extracted_text.txt'), 'w', encoding='utf-8') as f:
-                    for text_item in results['text']:
-                        f.write(f"=== Page {text_item['page']} ===\n")
-                        f.write(text_item['content'])
-                        f.write('\n\n')
+                    f.write("".join(
+                        f"=== Page {text_item['page']} ===\n{text_item['content']}\n\n" for text_item in results['text']
+                    ))
                     
             # Save tables as CSV files
             if results['tables']:
@@ -279,15 +1031,19 @@ class PDFParser:
                 os.makedirs(tables_dir, exist_ok=True)
                 for table in results['tables']:
                     table_path = os.path.join(tables_dir, f"page_{table['page']}_table_{table['table_num']}.csv")
-                    table['dataframe'].to_csv(table_path, index=False)
+                    if 'csv_bytes' in table:
+                        # Reuse the CSV encoded during extraction
+                        with open(table_path, 'wb') as f:
+                            f.write(table['csv_bytes'])
+                    else:
+                        table['dataframe'].to_csv(table_path, index=False)
                 
             # Save OCR text
             if results['ocr_text']:
                 with open(os.path.join(output_dir, 'ocr_text.txt'), 'w', encoding='utf-8') as f:
-                    for ocr_item in results['ocr_text']:
-                        f.write(f"=== Page {ocr_item['page']} ===\n")
-                        f.write(ocr_item['content'])
-                        f.write('\n\n')
+                    f.write("".join(
+                        f"=== Page {ocr_item['page']} ===\n{ocr_item['content']}\n\n" for ocr_item in results['ocr_text']
+                    ))
                         
             # Save images
             if results['images']:
@@ -295,7 +1051,12 @@ class PDFParser:
                 os.makedirs(images_dir, exist_ok=True)
                 for img_item in results['images']:
                     img_path = os.path.join(images_dir, f"page_{img_item['page']}.png")
-                    img_item['image'].save(img_path)
+                    if 'png_bytes' in img_item:
+                        # Reuse the PNG encoded during extraction
+                        with open(img_path, 'wb') as f:
+                            f.write(img_item['png_bytes'])
+                    else:
+                        img_item['image'].save(img_path, compress_level=1)
                 
             logger.info(f"Results saved to {output_dir}")
                 